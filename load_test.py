@@ -0,0 +1,483 @@
+"""
+Load-test harness for the JobFit AI Streamlit app.
+
+Drives N simulated concurrent sessions through the main() analyze flow using
+Streamlit's app testing API (streamlit.testing.v1.AppTest). Resume PDFs and the
+OpenAI chat completions endpoint are served by a local stub server, so no
+network access or API key is needed.
+
+Every concurrent session runs in its own worker process. AppTest swaps
+process-global runtime state on each run, so several AppTest instances cannot
+safely share one interpreter. All workers use the app directory as their
+working directory, which means the shared temp_resume.pdf path is contended
+exactly as it is on a deployed server. Each worker runs one untimed warm-up
+session first, so imports and compiling app.py are not counted as load.
+
+Memory figures are per worker process: the peak RSS of the largest worker and
+its growth after warm-up. They are not the footprint of one Streamlit server
+hosting N sessions, so do not read them as a capacity number.
+
+Each session gets its own resume containing a unique token. The model stub
+echoes that token back in the explanation, so a session that is handed another
+session's resume is reported as a "cross-session mixup" error.
+
+Usage:
+    python load_test.py --concurrency 1 2 4 8 --sessions-per-worker 3
+    python load_test.py --concurrency 16 --model-latency 1.5 --json report.json
+    python load_test.py --max-error-rate 0 --max-p95 10   # fail on regressions
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(APP_DIR, "app.py")
+
+# Fake key that passes the format checks in init_openai_client()
+STUB_API_KEY = "sk-loadtest" + "0" * 40
+
+TOKEN_PATTERN = re.compile(r"JOBFIT-[A-Za-z0-9_-]+")
+
+SAMPLE_JOB_DESCRIPTION = """
+Senior Python Engineer. We are looking for an experienced backend engineer to
+design, build and operate data-heavy web services. Responsibilities include
+owning REST APIs, writing well-tested Python code, working with PostgreSQL and
+Redis, deploying to AWS with Docker, and mentoring junior engineers.
+Requirements: 5+ years of Python, Django or FastAPI, SQL, cloud experience,
+strong communication skills. A degree in Computer Science is a plus.
+"""
+
+SAMPLE_RESUME_LINES = [
+    "Jane Doe - Backend Engineer",
+    "Experience: 6 years building Python services with Django and FastAPI.",
+    "Skills: Python, PostgreSQL, Redis, Docker, AWS, REST APIs, pytest.",
+    "Education: B.Sc. Computer Science.",
+]
+
+# Stub server for resume PDFs and the OpenAI API
+def build_resume_pdf(token):
+    """Build a small text PDF that embeds the session token"""
+    import fitz  # PyMuPDF
+
+    doc = fitz.open()
+    page = doc.new_page()
+    lines = SAMPLE_RESUME_LINES + [f"Candidate reference: {token}"]
+    page.insert_text((72, 72), "\n".join(lines), fontsize=11)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+def build_chat_completion(prompt_text):
+    """Build an OpenAI-style chat completion that echoes the resume token"""
+    token_match = TOKEN_PATTERN.search(prompt_text)
+    token = token_match.group(0) if token_match else "NO-TOKEN"
+    content = {
+        "overall_score": 7,
+        "explanation": f"Stub evaluation for {token}",
+        "matching_skills": ["Python", "Django", "PostgreSQL"],
+        "missing_skills": ["Kubernetes"],
+        "experience_match": "Experience aligns with the role",
+        "education_match": "Relevant degree",
+        "recommendations": ["Highlight cloud projects"],
+        "interview_likelihood": "High",
+        "key_strengths": ["Backend development"],
+        "areas_for_improvement": ["Container orchestration"]
+    }
+    return {
+        "id": "chatcmpl-loadtest",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": "gpt-4o-mini",
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": json.dumps(content)},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    }
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves /resume/<token>.pdf and /v1/chat/completions"""
+    pdf_latency = 0.0
+    model_latency = 0.0
+    pdf_cache = {}
+    pdf_lock = threading.Lock()
+
+    def do_GET(self):
+        match = re.fullmatch(r"/resume/(JOBFIT-[A-Za-z0-9_-]+)\.pdf", self.path)
+        if not match:
+            self.send_error(404)
+            return
+
+        token = match.group(1)
+        with self.pdf_lock:
+            if token not in self.pdf_cache:
+                self.pdf_cache[token] = build_resume_pdf(token)
+            data = self.pdf_cache[token]
+
+        time.sleep(self.pdf_latency)
+        self._send(200, "application/pdf", data)
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_error(404)
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self.send_error(400)
+            return
+
+        prompt_text = " ".join(
+            str(message.get("content", "")) for message in payload.get("messages", [])
+        )
+        time.sleep(self.model_latency)
+        body = json.dumps(build_chat_completion(prompt_text)).encode("utf-8")
+        self._send(200, "application/json", body)
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep the report output readable
+
+def start_stub_server(pdf_latency, model_latency):
+    """Start the stub server on a free local port in a background thread"""
+    StubHandler.pdf_latency = pdf_latency
+    StubHandler.model_latency = model_latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+# Worker process: one simulated browser session at a time
+def peak_rss_mb():
+    """Peak resident set size of the current process in MB"""
+    try:
+        import resource
+    except ImportError:
+        return None  # Not available on Windows
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+def run_session(stub_url, token, timeout):
+    """Run one session through the analyze flow and return its outcome"""
+    from streamlit.testing.v1 import AppTest
+
+    started = time.time()
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.secrets["OPENAI_API_KEY"] = STUB_API_KEY
+    at.run()
+
+    if at.exception:
+        return started, "app exception on load"
+    if not at.button:
+        return started, "app stopped before rendering"
+
+    at.text_area(key="job_description").input(SAMPLE_JOB_DESCRIPTION)
+    at.text_input(key="resume_url").input(f"{stub_url}/resume/{token}.pdf")
+    analyze_button = next(b for b in at.button if b.label == "Analyze Resume")
+    analyze_button.click().run()
+
+    if at.exception:
+        return started, "app exception on analyze"
+    if "last_evaluation" not in at.session_state:
+        return started, "no evaluation stored"
+
+    result = at.session_state["last_evaluation"]
+    if result.get("error"):
+        # Drop the volatile tail (paths, byte offsets) so errors group well
+        return started, result["error"].split(":")[0]
+    if token not in result.get("explanation", ""):
+        return started, "cross-session mixup"
+    return started, None
+
+def worker_main(worker_id, level, sessions, stub_url, timeout, start_event, results):
+    """Warm up, wait for the other workers, then run sessions back to back"""
+    os.chdir(APP_DIR)  # Share temp_resume.pdf with the other workers
+    os.environ["OPENAI_BASE_URL"] = f"{stub_url}/v1"
+
+    import streamlit.testing.v1  # noqa: F401  Exit early if streamlit is missing
+
+    # One untimed session pays for imports and compiling app.py up front
+    try:
+        run_session(stub_url, f"JOBFIT-c{level}-w{worker_id}-warmup", timeout)
+    except Exception:
+        pass  # Real failures show up again in the measured sessions
+    baseline_rss = peak_rss_mb()
+
+    results.put({"worker": worker_id, "ready": True})
+    start_event.wait()
+
+    for index in range(sessions):
+        token = f"JOBFIT-c{level}-w{worker_id}-s{index}"
+        try:
+            started, error = run_session(stub_url, token, timeout)
+        except Exception as e:
+            started, error = time.time(), f"{type(e).__name__}: {str(e)[:80]}"
+        finished = time.time()
+        results.put({
+            "worker": worker_id,
+            "started": started,
+            "finished": finished,
+            "latency": finished - started,
+            "error": error
+        })
+
+    results.put({
+        "worker": worker_id,
+        "baseline_rss_mb": baseline_rss,
+        "peak_rss_mb": peak_rss_mb()
+    })
+
+# Load levels and reporting
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+def wait_for_workers(workers, results, startup_timeout):
+    """Block until every worker has warmed up, failing fast if one exits"""
+    ready = set()
+    deadline = time.time() + startup_timeout
+    while len(ready) < len(workers):
+        try:
+            item = results.get(timeout=0.5)
+            ready.add(item["worker"])
+            continue
+        except queue.Empty:
+            pass
+
+        for worker_id, worker in enumerate(workers):
+            if worker_id not in ready and worker.exitcode is not None:
+                raise RuntimeError(
+                    f"Worker {worker_id} exited with code {worker.exitcode} "
+                    f"during startup; is streamlit installed?"
+                )
+        if time.time() > deadline:
+            raise RuntimeError(
+                f"Workers did not start within {startup_timeout:.0f}s"
+            )
+
+def run_level(concurrency, args, stub_url):
+    """Run one concurrency level and summarise it"""
+    ctx = multiprocessing.get_context("spawn")
+    # Workers report ready after warm-up; timing starts once all of them are
+    start_event = ctx.Event()
+    results = ctx.Queue()
+
+    workers = [
+        ctx.Process(
+            target=worker_main,
+            args=(i, concurrency, args.sessions_per_worker, stub_url,
+                  args.timeout, start_event, results),
+            daemon=True
+        )
+        for i in range(concurrency)
+    ]
+    for worker in workers:
+        worker.start()
+
+    try:
+        wait_for_workers(workers, results, args.startup_timeout)
+    except RuntimeError:
+        for worker in workers:
+            worker.terminate()
+        raise
+    start_event.set()
+    level_started = time.time()
+
+    sessions = []
+    memory = []
+    expected = concurrency * (args.sessions_per_worker + 1)
+    deadline = level_started + args.sessions_per_worker * args.timeout * 2 + 60
+    while len(sessions) + len(memory) < expected and time.time() < deadline:
+        try:
+            item = results.get(timeout=1)
+        except queue.Empty:
+            if not any(worker.is_alive() for worker in workers):
+                break
+            continue
+        (memory if "peak_rss_mb" in item else sessions).append(item)
+
+    for worker in workers:
+        worker.join(timeout=5)
+        if worker.is_alive():
+            worker.terminate()
+
+    # Sessions that never reported back count as failures
+    missing = concurrency * args.sessions_per_worker - len(sessions)
+    errors = Counter(s["error"] for s in sessions if s["error"])
+    if missing > 0:
+        errors["worker crashed or timed out"] += missing
+
+    total = concurrency * args.sessions_per_worker
+    latencies = [s["latency"] for s in sessions if not s["error"]]
+    if sessions:
+        wall = max(s["finished"] for s in sessions) - level_started
+    else:
+        wall = time.time() - level_started
+
+    peaks = [m["peak_rss_mb"] for m in memory if m["peak_rss_mb"] is not None]
+    deltas = [
+        m["peak_rss_mb"] - m["baseline_rss_mb"]
+        for m in memory
+        if m["peak_rss_mb"] is not None and m["baseline_rss_mb"] is not None
+    ]
+
+    return {
+        "concurrency": concurrency,
+        "sessions": total,
+        "succeeded": len(latencies),
+        "error_rate": sum(errors.values()) / total if total else 0.0,
+        "errors": dict(errors.most_common()),
+        "wall_time_s": wall,
+        "throughput_per_min": len(latencies) / wall * 60 if wall > 0 else 0.0,
+        "latency_s": {
+            "p50": percentile(latencies, 50),
+            "p90": percentile(latencies, 90),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": max(latencies) if latencies else None
+        },
+        "worker_peak_rss_mb": max(peaks) if peaks else None,
+        "worker_rss_growth_mb": max(deltas) if deltas else None
+    }
+
+def format_number(value, digits=2):
+    return "-" if value is None else f"{value:.{digits}f}"
+
+def print_report(levels):
+    """Print a plain-text table of the results"""
+    header = (
+        f"{'conc':>4} {'ok/total':>9} {'err%':>6} {'sess/min':>9} "
+        f"{'p50 s':>7} {'p90 s':>7} {'p95 s':>7} {'p99 s':>7} {'max s':>7} "
+        f"{'wrk MB':>8} {'+wrk MB':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+    for level in levels:
+        latency = level["latency_s"]
+        print(
+            f"{level['concurrency']:>4} "
+            f"{level['succeeded']:>4}/{level['sessions']:<4} "
+            f"{level['error_rate'] * 100:>6.1f} "
+            f"{level['throughput_per_min']:>9.1f} "
+            f"{format_number(latency['p50']):>7} {format_number(latency['p90']):>7} "
+            f"{format_number(latency['p95']):>7} {format_number(latency['p99']):>7} "
+            f"{format_number(latency['max']):>7} "
+            f"{format_number(level['worker_peak_rss_mb'], 1):>8} "
+            f"{format_number(level['worker_rss_growth_mb'], 1):>8}"
+        )
+    print("wrk MB / +wrk MB: peak RSS of the largest worker process and its growth")
+    print("after warm-up. Each session runs in its own process, so these are not")
+    print("the memory of one server hosting N sessions.")
+
+    for level in levels:
+        for message, count in level["errors"].items():
+            print(f"  [concurrency {level['concurrency']}] {count}x {message}")
+
+def check_thresholds(levels, max_error_rate, max_p95):
+    """Return a list of threshold violations for regression checks"""
+    failures = []
+    for level in levels:
+        if max_error_rate is not None and level["error_rate"] > max_error_rate:
+            failures.append(
+                f"concurrency {level['concurrency']}: error rate "
+                f"{level['error_rate']:.2%} > {max_error_rate:.2%}"
+            )
+        p95 = level["latency_s"]["p95"]
+        if max_p95 is not None and (p95 is None or p95 > max_p95):
+            failures.append(
+                f"concurrency {level['concurrency']}: p95 latency "
+                f"{format_number(p95)}s > {max_p95:.2f}s"
+            )
+    return failures
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the JobFit AI analyze flow")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="Concurrent session counts to run, one level each")
+    parser.add_argument("--sessions-per-worker", type=int, default=3,
+                        help="Sessions each concurrent worker runs back to back")
+    parser.add_argument("--pdf-latency", type=float, default=0.1,
+                        help="Seconds the stub waits before serving a resume")
+    parser.add_argument("--model-latency", type=float, default=1.0,
+                        help="Seconds the stub waits before answering the model call")
+    parser.add_argument("--timeout", type=float, default=60.0,
+                        help="Per-script-run timeout for AppTest, in seconds")
+    parser.add_argument("--startup-timeout", type=float, default=120.0,
+                        help="Seconds to wait for worker processes to start")
+    parser.add_argument("--json", dest="json_path",
+                        help="Also write the full report to this JSON file")
+    parser.add_argument("--max-error-rate", type=float,
+                        help="Exit non-zero if any level exceeds this error rate (0-1)")
+    parser.add_argument("--max-p95", type=float,
+                        help="Exit non-zero if any level's p95 latency exceeds this, in seconds")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = start_stub_server(args.pdf_latency, args.model_latency)
+    stub_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    levels = []
+    aborted = None
+    try:
+        for concurrency in args.concurrency:
+            print(f"Running {concurrency} concurrent session(s)...", flush=True)
+            levels.append(run_level(concurrency, args, stub_url))
+    except RuntimeError as e:
+        aborted = f"concurrency {concurrency}: {str(e)}"
+    finally:
+        server.shutdown()
+
+    print()
+    print_report(levels)
+
+    if args.json_path:
+        report = {
+            "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "settings": {
+                "sessions_per_worker": args.sessions_per_worker,
+                "pdf_latency_s": args.pdf_latency,
+                "model_latency_s": args.model_latency
+            },
+            "levels": levels,
+            "aborted": aborted
+        }
+        with open(args.json_path, "w") as file:
+            json.dump(report, file, indent=2)
+
+    failures = check_thresholds(levels, args.max_error_rate, args.max_p95)
+    if aborted:
+        failures.append(aborted)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())